@@ -13,27 +13,38 @@ class Server(BaseModel):
 
 
 class FastMCPHttpClient:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session: Optional[requests.Session] = None):
         """Initialize the FastMCP HTTP client.
 
         Args:
             base_url: Base URL of the FastMCP HTTP server
+            session: Optional requests session to share keep-alive connections
         """
         self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
 
     def list_servers(self) -> List[Server]:
         """List available servers from the server, only works for registry servers."""
-        response = requests.get(f"{self.base_url}/servers")
+        response = self.session.get(f"{self.base_url}/servers")
         response.raise_for_status()
         return [Server.model_validate(server) for server in response.json()]
 
-    def list_tools(self, server_name: Optional[str] = None) -> List[Tool]:
-        """List available tools from the server."""
+    def list_tools(
+        self, server_name: Optional[str] = None, timeout: Optional[float] = None
+    ) -> List[Tool]:
+        """List available tools from the server.
+
+        Args:
+            server_name: Only list tools of this server, for registry servers
+            timeout: Seconds to wait for the server, or None to wait indefinitely
+        """
         params = {}
         if server_name is not None:
             params["server_name"] = server_name
 
-        response = requests.get(f"{self.base_url}/tools", params=params)
+        response = self.session.get(
+            f"{self.base_url}/tools", params=params, timeout=timeout
+        )
         response.raise_for_status()
         return [Tool.model_validate(tool) for tool in response.json()]
 
@@ -42,7 +53,7 @@ class FastMCPHttpClient:
     ) -> List[TextContent | ImageContent | EmbeddedResource]:
         """Call a tool with the given arguments."""
         payload = {"name": name, **arguments}
-        response = requests.post(f"{self.base_url}/tools/call_tool", json=payload)
+        response = self.session.post(f"{self.base_url}/tools/call_tool", json=payload)
         response.raise_for_status()
 
         contents = []
@@ -57,26 +68,47 @@ class FastMCPHttpClient:
                 raise ValueError(f"Unknown content type: {content_data.get('type')}")
         return contents
 
+    def batch(self, calls: List[tuple[str, dict[str, Any]]]) -> List[dict[str, Any]]:
+        """Send several JSON-RPC 2.0 calls to the server in a single request.
+
+        Args:
+            calls: (method, params) pairs, e.g. ("list_tools", {}) or
+                ("call_tool", {"name": ..., "arguments": {...}})
+
+        Returns:
+            The JSON-RPC response objects, in the same order as the calls
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        response = self.session.post(f"{self.base_url}/batch", json=payload)
+        response.raise_for_status()
+
+        responses = {item.get("id"): item for item in response.json()}
+        missing = {"error": {"code": -32603, "message": "No response"}}
+        return [responses.get(i, missing) for i in range(len(calls))]
+
     def list_resources(self) -> List[Resource]:
         """List available resources from the server."""
-        response = requests.get(f"{self.base_url}/resources")
+        response = self.session.get(f"{self.base_url}/resources")
         response.raise_for_status()
         return [Resource.model_validate(resource) for resource in response.json()]
 
     def read_resource(self, uri: str) -> bytes:
         """Read a resource from the server."""
-        response = requests.get(f"{self.base_url}/resources/{uri}")
+        response = self.session.get(f"{self.base_url}/resources/{uri}")
         response.raise_for_status()
         return response.content
 
     def list_prompts(self) -> List[Prompt]:
         """List available prompts from the server."""
-        response = requests.get(f"{self.base_url}/prompts")
+        response = self.session.get(f"{self.base_url}/prompts")
         response.raise_for_status()
         return [Prompt.model_validate(prompt) for prompt in response.json()]
 
     def get_prompt(self, name: str, arguments: dict[str, Any]) -> Prompt:
         """Get a prompt with the given arguments."""
-        response = requests.post(f"{self.base_url}/prompts/{name}", json=arguments)
+        response = self.session.post(f"{self.base_url}/prompts/{name}", json=arguments)
         response.raise_for_status()
         return response.json()
@@ -1,20 +1,32 @@
-from typing import Any, List
+from typing import Any, List, Optional
+import requests
 from mcp import Tool, Resource
 from mcp.types import Prompt, TextContent, ImageContent, EmbeddedResource
 
 class FastMCPHttpClient:
     base_url: str
+    session: requests.Session
 
-    def __init__(self, base_url: str) -> None:
+    def __init__(
+        self, base_url: str, session: Optional[requests.Session] = None
+    ) -> None:
         """Initialize the FastMCP HTTP client.
 
         Args:
             base_url: Base URL of the FastMCP HTTP server
+            session: Optional requests session to share keep-alive connections
         """
         ...
 
-    def list_tools(self) -> List[Tool]:
-        """List available tools from the server."""
+    def list_tools(
+        self, server_name: Optional[str] = None, timeout: Optional[float] = None
+    ) -> List[Tool]:
+        """List available tools from the server.
+
+        Args:
+            server_name: Only list tools of this server, for registry servers
+            timeout: Seconds to wait for the server, or None to wait indefinitely
+        """
         ...
 
     def call_tool(
@@ -23,6 +35,18 @@ class FastMCPHttpClient:
         """Call a tool with the given arguments."""
         ...
 
+    def batch(self, calls: List[tuple[str, dict[str, Any]]]) -> List[dict[str, Any]]:
+        """Send several JSON-RPC 2.0 calls to the server in a single request.
+
+        Args:
+            calls: (method, params) pairs, e.g. ("list_tools", {}) or
+                ("call_tool", {"name": ..., "arguments": {...}})
+
+        Returns:
+            The JSON-RPC response objects, in the same order as the calls
+        """
+        ...
+
     def list_resources(self) -> List[Resource]:
         """List available resources from the server."""
         ...
@@ -5,6 +5,14 @@ import json
 import requests
 
 
+def _rpc_error(call_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": call_id,
+        "error": {"code": code, "message": message},
+    }
+
+
 class FastMCPHttpServer(FastMCP):
     def __init__(
         self,
@@ -32,6 +40,19 @@ class FastMCPHttpServer(FastMCP):
             result = await self.call_tool(name, arguments)
             return json.dumps([content.model_dump() for content in result])
 
+        @self.flask_app.route("/batch", methods=["POST"])
+        async def batch():
+            try:
+                calls = json.loads(request.get_data())
+            except ValueError:
+                return json.dumps(_rpc_error(None, -32700, "Parse error"))
+
+            if not isinstance(calls, list):
+                return json.dumps(await self._handle_rpc(calls))
+            if not calls:
+                return json.dumps(_rpc_error(None, -32600, "Invalid Request"))
+            return json.dumps([await self._handle_rpc(call) for call in calls])
+
         @self.flask_app.route("/resources", methods=["GET"])
         async def list_resources():
             resources = await self.list_resources()
@@ -80,6 +101,34 @@ class FastMCPHttpServer(FastMCP):
                 }
             )
 
+    async def _handle_rpc(self, call: Any) -> dict[str, Any]:
+        """Handle a single JSON-RPC 2.0 request."""
+        if not isinstance(call, dict) or not isinstance(call.get("method"), str):
+            return _rpc_error(None, -32600, "Invalid Request")
+
+        call_id = call.get("id")
+        params = call.get("params") or {}
+        if not isinstance(params, dict):
+            return _rpc_error(call_id, -32602, "Invalid params")
+
+        try:
+            if call["method"] == "list_tools":
+                tools = await self.list_tools()
+                result = [tool.model_dump() for tool in tools]
+            elif call["method"] == "call_tool":
+                name = params.get("name")
+                arguments = params.get("arguments", {})
+                if not isinstance(name, str) or not isinstance(arguments, dict):
+                    return _rpc_error(call_id, -32602, "Invalid params")
+                contents = await self.call_tool(name, arguments)
+                result = [content.model_dump() for content in contents]
+            else:
+                return _rpc_error(call_id, -32601, "Method not found")
+        except Exception as e:
+            return _rpc_error(call_id, -32603, str(e))
+
+        return {"jsonrpc": "2.0", "id": call_id, "result": result}
+
     def register_server(
         self,
         server_url: str = "http://127.0.0.1",
@@ -29,6 +29,7 @@ class FastMCPHttpServer(FastMCP):
         - GET /resources/<uri>: Read a specific resource
         - GET /prompts: List available prompts
         - POST /prompts/<name>: Get a specific prompt
+        - POST /batch: Handle a JSON-RPC 2.0 request or batch of requests
         """
         ...
 
@@ -1,8 +1,7 @@
-import json
 import sys
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QObject, QRunnable, QSize, QThreadPool, Signal
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -24,6 +23,25 @@ from PySide6.QtWidgets import (
 from mcp.types import Tool
 from fastmcp_http.client import FastMCPHttpClient
 
+# Last /servers.json response from the registry, revalidated with its ETag
+_SERVERS_JSON_CACHE = {"etag": None, "data": {}}
+
+
+def _load_servers_json(client: FastMCPHttpClient) -> dict:
+    """Return the registry's persisted servers, reusing the cached copy if unchanged."""
+    headers = {}
+    if _SERVERS_JSON_CACHE["etag"] is not None:
+        headers["If-None-Match"] = _SERVERS_JSON_CACHE["etag"]
+
+    response = client.session.get(f"{client.base_url}/servers.json", headers=headers)
+    if response.status_code == 304:
+        return _SERVERS_JSON_CACHE["data"]
+    response.raise_for_status()
+
+    _SERVERS_JSON_CACHE["data"] = response.json()
+    _SERVERS_JSON_CACHE["etag"] = response.headers.get("ETag")
+    return _SERVERS_JSON_CACHE["data"]
+
 
 class ServerTreeItem(QTreeWidgetItem):
     def __init__(self, name: str, is_server: bool = False):
@@ -33,6 +51,29 @@ class ServerTreeItem(QTreeWidgetItem):
         self.tool_name = None if is_server else name
 
 
+class ToolLoaderSignals(QObject):
+    loaded = Signal(str, list)
+    failed = Signal(str, str)
+
+
+class ToolLoader(QRunnable):
+    """Fetch the tools of a server off the GUI thread."""
+
+    def __init__(self, client: FastMCPHttpClient, server_name: str):
+        super().__init__()
+        self.client = client
+        self.server_name = server_name
+        self.signals = ToolLoaderSignals()
+
+    def run(self):
+        try:
+            tools = self.client.list_tools(self.server_name)
+        except Exception as e:
+            self.signals.failed.emit(self.server_name, str(e))
+            return
+        self.signals.loaded.emit(self.server_name, tools)
+
+
 class MCPExplorer(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -58,6 +99,14 @@ class MCPExplorer(QMainWindow):
         self.tree = QTreeWidget()
         self.tree.setHeaderLabel("Servers")
         self.tree.itemClicked.connect(self.on_item_selected)
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+        self.tool_loaders: dict[str, ToolLoader] = {}
+
+        # Load the status icons once from the directory of the current script
+        script_dir = Path(__file__).parent
+        self._green_icon = QIcon(str(script_dir / "green.png"))
+        self._red_icon = QIcon(str(script_dir / "red.png"))
+        self.tree.setIconSize(QSize(10, 10))
         self.splitter.addWidget(self.tree)
 
         # Create info panel
@@ -78,66 +127,106 @@ class MCPExplorer(QMainWindow):
         self.tree.clear()
 
         try:
-            with open("servers.json") as f:
-                servers = json.load(f)
+            servers = _load_servers_json(self.client)
 
             available_servers = set(
                 server.name for server in self.client.list_servers()
             )
 
-            # Get the directory of the current script
-            script_dir = Path(__file__).parent
-
             for server_name, server_info in servers.items():
                 server_item = ServerTreeItem(server_name, is_server=True)
                 self.tree.addTopLevelItem(server_item)
 
                 # Check if server is online and set icon
                 is_online = server_name in available_servers
-                icon_path = script_dir / ("green.png" if is_online else "red.png")
-                icon = QIcon(str(icon_path))
-                # Set icon size to 12x12 pixels
-                self.tree.setIconSize(QSize(10, 10))
-                server_item.setIcon(0, icon)
+                server_item.setIcon(
+                    0, self._green_icon if is_online else self._red_icon
+                )
 
                 if is_online:
-                    # Get tools for online server
-                    tools = self.client.list_tools(server_name)
-                    for tool in tools:
-                        # Strip server name from tool name
-                        display_name = tool.name.split(".")[-1]
-                        tool_item = ServerTreeItem(display_name)
-                        tool_item.full_tool_name = (
-                            tool.name
-                        )  # Store full name for reference
-                        server_item.addChild(tool_item)
-
-                    # Expand the server item
-                    server_item.setExpanded(True)
+                    # Tools are fetched when the server item is first expanded
+                    server_item.addChild(QTreeWidgetItem(["Loading…"]))
+                    server_item.setData(0, Qt.UserRole, "unloaded")
 
         except Exception as e:
             print(f"Error loading servers: {e}")
 
+    def find_server_item(self, server_name: str) -> ServerTreeItem | None:
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            if item.server_name == server_name:
+                return item
+        return None
+
+    def on_item_expanded(self, item: QTreeWidgetItem):
+        if item.data(0, Qt.UserRole) != "unloaded":
+            return
+        item.setData(0, Qt.UserRole, "loading")
+        if item.server_name in self.tool_loaders:
+            return  # A fetch from before the last refresh is still running
+
+        loader = ToolLoader(self.client, item.server_name)
+        loader.signals.loaded.connect(self.on_tools_loaded)
+        loader.signals.failed.connect(self.on_tools_failed)
+        self.tool_loaders[item.server_name] = loader
+        QThreadPool.globalInstance().start(loader)
+
+    def on_tools_loaded(self, server_name: str, tools: list[Tool]):
+        self.tool_loaders.pop(server_name, None)
+        server_item = self.find_server_item(server_name)
+        if server_item is None:
+            return
+
+        server_item.takeChildren()
+        for tool in tools:
+            # Strip server name from tool name
+            display_name = tool.name.split(".")[-1]
+            tool_item = ServerTreeItem(display_name)
+            tool_item.full_tool_name = tool.name  # Store full name for reference
+            server_item.addChild(tool_item)
+        server_item.setData(0, Qt.UserRole, "loaded")
+
+    def on_tools_failed(self, server_name: str, error: str):
+        self.tool_loaders.pop(server_name, None)
+        print(f"Error loading tools for {server_name}: {error}")
+        server_item = self.find_server_item(server_name)
+        if server_item is None:
+            return
+
+        # Allow another attempt the next time the item is expanded
+        server_item.takeChildren()
+        server_item.addChild(QTreeWidgetItem(["Failed to load tools"]))
+        server_item.setData(0, Qt.UserRole, "unloaded")
+        server_item.setExpanded(False)
+
     def get_server_tools(self, server_info) -> list[Tool]:
         return self.client.list_tools(server_info["name"])
 
     def on_item_selected(self, item: ServerTreeItem):
-        # Clear previous info
-        for i in reversed(range(self.info_layout.count())):
-            layout_item = self.info_layout.itemAt(i)
-            if layout_item.widget():  # Check if the item has a widget
-                layout_item.widget().setParent(None)
-            else:
-                self.info_layout.removeItem(layout_item)
+        if not isinstance(item, ServerTreeItem):
+            return  # Placeholder rows carry no server or tool info
 
-        if item.is_server:
-            self.show_server_info(item.server_name)
-        else:
-            self.show_tool_info(item.parent().server_name, item.tool_name)
+        # Suspend repaints so the whole rebuild triggers a single repaint
+        viewport = self.info_scroll.viewport()
+        viewport.setUpdatesEnabled(False)
+        self.info_widget.setUpdatesEnabled(False)
+        try:
+            # Clear previous info
+            while (layout_item := self.info_layout.takeAt(0)) is not None:
+                widget = layout_item.widget()
+                if widget:
+                    widget.deleteLater()
+
+            if item.is_server:
+                self.show_server_info(item.server_name)
+            else:
+                self.show_tool_info(item.parent().server_name, item.tool_name)
+        finally:
+            self.info_widget.setUpdatesEnabled(True)
+            viewport.setUpdatesEnabled(True)
 
     def show_server_info(self, server_name: str):
-        with open("servers.json") as f:
-            servers = json.load(f)
+        servers = _load_servers_json(self.client)
 
         server = servers[server_name]
 
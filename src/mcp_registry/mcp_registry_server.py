@@ -1,14 +1,23 @@
 import time
-from flask import Flask, request, jsonify
-from dataclasses import dataclass
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request
+from dataclasses import dataclass, field, fields
+from functools import partial
+from typing import Dict, Iterator
+import hashlib
+import os
 import socket
 import random
-import json
+import uuid
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from waitress import serve
 from pathlib import Path
-from datetime import datetime, timedelta
-from threading import Thread
+from datetime import datetime
+from threading import RLock, Thread
+
+from mcp import Tool
 
 from fastmcp_http.client import FastMCPHttpClient
 from src.mcp_registry.permission_management import permission_server
@@ -22,19 +31,85 @@ class Server:
     description: str
     url: str
     port: int
+    base_url: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.base_url = f"{self.url}:{self.port}"
+
+    def to_dict(self) -> dict:
+        """Return the persisted fields of the server."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
 
 
 # Global dictionaries to store servers and health status
 servers: Dict[str, Server] = {}
 health_cache: Dict[str, tuple[datetime, bool]] = {}
 
+# Guards the shared registry state mutated from concurrent request threads
+STATE_LOCK = RLock()
+
+# Shared HTTP session so health checks and tool calls reuse keep-alive connections
+SESSION = requests.Session()
+SESSION.mount(
+    "http://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+)
+
+# Cached clients for each registered server, keyed by base URL
+CLIENTS: Dict[str, FastMCPHttpClient] = {}
+
+# Version of the registered tool set, bumped whenever servers come or go
+TOOLS_VERSION = 0
+
+# Random per-process token in /tools ETags, so tags from before a restart never match
+TOOLS_ETAG_TOKEN = uuid.uuid4().hex
+
+# Cached /tools responses keyed by server name ("" for all servers): (etag, body)
+TOOLS_CACHE: Dict[str, tuple[str, bytes]] = {}
+
+# Tool names known per server and when they were last listed (time.monotonic)
+TOOL_INDEX: Dict[str, set[str]] = {}
+TOOL_INDEX_MTIME: Dict[str, float] = {}
+TOOL_INDEX_TTL = 60
+
+# Health probing, in seconds: background refresh interval, timeout for startup and
+# first-use probes, and the shorter timeout used by the background loop
+HEALTH_CHECK_INTERVAL = 15
+HEALTH_PROBE_TIMEOUT = 5
+HEALTH_LOOP_TIMEOUT = 1
+
+# Seconds to wait for a backend to list its tools
+LIST_TOOLS_TIMEOUT = 5
+
+# Separate thread pools for health checks and tool listings, so slow listings
+# can never starve health probing
+HEALTH_POOL = ThreadPoolExecutor(max_workers=16)
+TOOLS_POOL = ThreadPoolExecutor(max_workers=16)
+
 # Add constants for storage
 STORAGE_FILE = Path("servers.json")
 
+# Parsed contents of STORAGE_FILE, reparsed only when its mtime changes
+_SERVERS_JSON_CACHE = {"mtime": 0, "data": {}}
+
+# (etag, body) of the serialized STORAGE_FILE, swapped as one value by save_servers
+_SERVERS_BLOB: tuple[str, bytes] = ('"0"', b"{}")
+
 # Add constant for permission server name
 PERMISSION_SERVER_NAME = "PermissionServer"
 
 
+def _probe_socket() -> socket.socket:
+    """Create a TCP socket for probing free ports.
+
+    SO_REUSEADDR lets ports lingering in TIME_WAIT be reused. It is skipped on
+    Windows, where it would also allow binding to ports that are in active use.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if os.name != "nt":
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    return sock
+
+
 def _generate_port(
     server_url: str, start_port: int = 5000, end_port: int = 65535
 ) -> int:
@@ -53,26 +128,70 @@ def _generate_port(
 
     host = urlparse(server_url).hostname or "127.0.0.1"
 
+    # Let the kernel hand out a free ephemeral port when no range is imposed
+    if start_port == 5000 and end_port == 65535:
+        with _probe_socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
     # Start with a random port in the range
     port = random.randint(start_port, end_port)
 
     while port <= end_port:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            sock.bind((host, port))
-            sock.close()
-            return port
-        except socket.error:
-            port += 1
-        finally:
-            sock.close()
+        with _probe_socket() as sock:
+            try:
+                sock.bind((host, port))
+                return port
+            except socket.error:
+                port += 1
 
     raise RuntimeError("No available ports found in the specified range")
 
 
+def _index_tools(server_name: str, tools: list[Tool]) -> set[str]:
+    """Remember which tools a server exposes so call_tool can skip discovery."""
+    names = {tool.name for tool in tools}
+    TOOL_INDEX[server_name] = names
+    TOOL_INDEX_MTIME[server_name] = time.monotonic()
+    return names
+
+
+def _indexed_tools(server_name: str) -> set[str] | None:
+    """Return the indexed tool names of a server, or None if the entry is stale."""
+    indexed_at = TOOL_INDEX_MTIME.get(server_name)
+    if indexed_at is None or time.monotonic() - indexed_at >= TOOL_INDEX_TTL:
+        return None
+    return TOOL_INDEX.get(server_name)
+
+
+def _evict_tool_index(server_name: str):
+    TOOL_INDEX.pop(server_name, None)
+    TOOL_INDEX_MTIME.pop(server_name, None)
+
+
+def _bump_tools_version():
+    """Invalidate cached /tools responses after the set of servers changed."""
+    global TOOLS_VERSION
+    with STATE_LOCK:
+        TOOLS_VERSION += 1
+        TOOLS_CACHE.clear()
+
+
+def _get_client(server: Server) -> FastMCPHttpClient:
+    """Return the cached client for a server, creating it on first use."""
+    client = CLIENTS.get(server.base_url)
+    if client is None:
+        client = CLIENTS.setdefault(
+            server.base_url, FastMCPHttpClient(server.base_url, session=SESSION)
+        )
+    return client
+
+
 def check_server_health(server: Server) -> bool:
-    """Check if a server is healthy by pinging its health endpoint.
-    Caches the result for 1 minutes.
+    """Return the last known health of a server without blocking on the network.
+
+    Results are refreshed by the background health loop. Servers that have not
+    been probed yet are checked synchronously once.
 
     Args:
         server: Server instance to check
@@ -80,22 +199,65 @@ def check_server_health(server: Server) -> bool:
     Returns:
         bool: True if server is healthy, False otherwise
     """
-    # Check if we have a recent cached result
-    if server.name in health_cache:
-        last_check, is_healthy = health_cache[server.name]
-        if datetime.now() - last_check < timedelta(seconds=30):
-            return is_healthy
+    cached = health_cache.get(server.name)
+    if cached is None:
+        return probe_server_health(server)
+    return cached[1]
+
+
+def probe_server_health(
+    server: Server, timeout: float = HEALTH_PROBE_TIMEOUT
+) -> bool:
+    """Ping a server's health endpoint and store the result in the health cache.
+
+    Args:
+        server: Server instance to check
+        timeout: Seconds to wait for the health endpoint to answer
 
+    Returns:
+        bool: True if server is healthy, False otherwise
+    """
     try:
-        response = requests.get(f"{server.url}:{server.port}/health", timeout=5)
+        response = SESSION.get(f"{server.base_url}/health", timeout=timeout)
         is_healthy = response.status_code == 200
     except requests.RequestException:
         is_healthy = False
 
-    health_cache[server.name] = (datetime.now(), is_healthy)
+    _set_health(server.name, is_healthy)
     return is_healthy
 
 
+def _healthy_servers(candidates: list[Server]) -> list[Server]:
+    """Return the healthy servers, probing any not yet checked concurrently."""
+    unprobed = [server for server in candidates if server.name not in health_cache]
+    list(HEALTH_POOL.map(probe_server_health, unprobed))
+    return [server for server in candidates if check_server_health(server)]
+
+
+def _health_loop():
+    """Refresh the health of every registered server in the background."""
+    while True:
+        try:
+            list(
+                HEALTH_POOL.map(
+                    partial(probe_server_health, timeout=HEALTH_LOOP_TIMEOUT),
+                    list(servers.values()),
+                )
+            )
+        except Exception as e:
+            print(f"Error checking server health: {e}")
+        time.sleep(HEALTH_CHECK_INTERVAL)
+
+
+def _set_health(server_name: str, is_healthy: bool):
+    """Store a health result, invalidating cached tools if the status flipped."""
+    with STATE_LOCK:
+        previous = health_cache.get(server_name)
+        health_cache[server_name] = (datetime.now(), is_healthy)
+        if previous is not None and previous[1] != is_healthy:
+            _bump_tools_version()
+
+
 def load_servers() -> Dict[str, Server]:
     """Load servers from storage and verify they're running."""
     if not STORAGE_FILE.exists():
@@ -103,38 +265,86 @@ def load_servers() -> Dict[str, Server]:
 
     servers = {}
     try:
-        with open(STORAGE_FILE, "r") as f:
-            data = json.load(f)
-            for server_data in data.values():
-                server = Server(**server_data)
-                if check_server_health(server):
-                    servers[server.name] = server
-                else:
-                    print(f"Server {server.name} appears to be down, skipping...")
+        data = _load_servers_json()
+        candidates = [Server(**server_data) for server_data in data.values()]
+        for server, is_healthy in zip(
+            candidates, HEALTH_POOL.map(probe_server_health, candidates)
+        ):
+            if is_healthy:
+                servers[server.name] = server
+            else:
+                print(f"Server {server.name} appears to be down, skipping...")
     except Exception as e:
         print(f"Error loading servers: {e}")
 
     return servers
 
 
+def _load_servers_json() -> dict:
+    """Return the parsed contents of STORAGE_FILE, reusing the cached copy if unchanged."""
+    mtime = STORAGE_FILE.stat().st_mtime_ns
+    if mtime != _SERVERS_JSON_CACHE["mtime"]:
+        _SERVERS_JSON_CACHE["data"] = orjson.loads(STORAGE_FILE.read_bytes())
+        _SERVERS_JSON_CACHE["mtime"] = mtime
+    return _SERVERS_JSON_CACHE["data"]
+
+
 def save_servers():
     """Save current servers to storage."""
-    with open(STORAGE_FILE, "w") as f:
-        json.dump({name: vars(server) for name, server in servers.items()}, f)
+    global _SERVERS_BLOB
+    data = {name: server.to_dict() for name, server in servers.items()}
+    body = orjson.dumps(data)
+
+    # Write to a temporary file first so readers never see a partial file
+    tmp_file = STORAGE_FILE.with_name(STORAGE_FILE.name + ".tmp")
+    tmp_file.write_bytes(body)
+    os.replace(tmp_file, STORAGE_FILE)
+
+    _SERVERS_BLOB = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+    _SERVERS_JSON_CACHE["data"] = data
+    _SERVERS_JSON_CACHE["mtime"] = STORAGE_FILE.stat().st_mtime_ns
+
+
+def _json_response(data, status: int = 200) -> Response:
+    """Serialize data with orjson into a JSON response."""
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+
+# Fixed error responses, built once at import time
+ERR_INVALID_JSON = _json_response(
+    {"error": "Request body must be a JSON object"}, 400
+)
+ERR_MISSING_FIELDS = _json_response({"error": "Missing required fields"}, 400)
+ERR_RESERVED_NAME = _json_response({"error": "Reserved server name"}, 403)
+ERR_NO_NAME = _json_response({"error": "Tool name not provided"}, 400)
+ERR_UNAUTHORIZED_SERVER = _json_response(
+    {"error": "Permission denied: unauthorized server"}, 403
+)
+
+
+def _parse_json_object() -> dict | None:
+    """Parse the request body as a JSON object, returning None if it isn't one."""
+    try:
+        data = orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
 
 
 @app.route("/register_server", methods=["POST"])
 def register_server():
-    data = request.get_json()
+    data = _parse_json_object()
+    if data is None:
+        return ERR_INVALID_JSON
 
     # Validate required fields
     required_fields = ["server_url", "server_name", "server_description"]
     if not all(field in data for field in required_fields):
-        return jsonify({"error": "Missing required fields"}), 400
+        return ERR_MISSING_FIELDS
 
     # Block registration of permission server name by other servers
     if data["server_name"] == PERMISSION_SERVER_NAME:
-        return jsonify({"error": "Reserved server name"}), 403
+        return ERR_RESERVED_NAME
 
     port = _generate_port(data["server_url"])
 
@@ -147,22 +357,24 @@ def register_server():
     )
 
     # Add to global dictionary
-    servers[data["server_name"]] = new_server
-    save_servers()  # Save after registration
+    with STATE_LOCK:
+        servers[data["server_name"]] = new_server
+        health_cache.pop(new_server.name, None)  # Probe the new address on next use
+        _evict_tool_index(new_server.name)
+        save_servers()  # Save after registration
+        _bump_tools_version()
     print("Added server: ", data["server_name"])
 
-    return (
-        jsonify(
-            {
-                "message": "Server registered successfully",
-                "server": {
-                    "name": new_server.name,
-                    "url": new_server.url,
-                    "description": new_server.description,
-                    "port": port,
-                },
-            }
-        ),
+    return _json_response(
+        {
+            "message": "Server registered successfully",
+            "server": {
+                "name": new_server.name,
+                "url": new_server.url,
+                "description": new_server.description,
+                "port": port,
+            },
+        },
         201,
     )
 
@@ -170,7 +382,7 @@ def register_server():
 @app.route("/servers", methods=["GET"])
 def get_servers():
     """Return a list of all registered and healthy servers."""
-    return jsonify(
+    return _json_response(
         [
             {
                 "name": server.name,
@@ -178,50 +390,161 @@ def get_servers():
                 "description": server.description,
                 "port": server.port,
             }
-            for server in servers.values()
-            if check_server_health(server)
+            for server in _healthy_servers(list(servers.values()))
         ]
     )
 
 
+@app.route("/servers.json", methods=["GET"])
+def get_servers_json():
+    """Return the persisted server registry, as stored in STORAGE_FILE."""
+    etag, body = _SERVERS_BLOB
+    if request.headers.get("If-None-Match") == etag:
+        return "", 304
+    return Response(body, mimetype="application/json", headers={"ETag": etag})
+
+
+def _fetch_tools(server: Server) -> list[Tool]:
+    """Fetch the tools of a single server, prefixed with the server name."""
+    try:
+        if not check_server_health(server):
+            return []
+        tools = _get_client(server).list_tools(timeout=LIST_TOOLS_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Error fetching tools from {server.name}: {e}")
+        _set_health(server.name, False)
+        return []
+
+    _index_tools(server.name, tools)
+    return [
+        tool.model_copy(update={"name": f"{server.name}.{tool.name}"})
+        for tool in tools
+    ]
+
+
+def _tools_response(etag: str, body: bytes) -> Response:
+    return Response(
+        body,
+        mimetype="application/json",
+        headers={"ETag": etag, "Cache-Control": "max-age=30"},
+    )
+
+
 @app.route("/tools", methods=["GET"])
 def get_tools():
     """Return a list of tools from registered servers."""
     server_name = request.args.get("server_name")
+    cache_key = server_name or ""
 
-    all_tools = []
-    try:
-        # Filter servers if server_name is provided
-        target_servers = [servers[server_name]] if server_name else servers.values()
-
-        for server in target_servers:
+    # Filter servers if server_name is provided
+    if server_name:
+        server = servers.get(server_name)
+        if server is None:
+            return _json_response({"error": f"Server '{server_name}' not found"}, 404)
+        target_servers = [server]
+    else:
+        target_servers = list(servers.values())
+
+    version = TOOLS_VERSION
+    etag = f'W/"{TOOLS_ETAG_TOKEN}-{version}-{server_name or "all"}"'
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers={"ETag": etag})
+
+    cached = TOOLS_CACHE.get(cache_key)
+    if cached is not None and cached[0] == etag:
+        return _tools_response(etag, cached[1])
+
+    # All list_tools requests are in flight at once over pooled connections;
+    # results are written in registration order so cached bodies stay stable.
+    futures = [TOOLS_POOL.submit(_fetch_tools, s) for s in target_servers]
+
+    def _stream() -> Iterator[bytes]:
+        """Yield the JSON array server by server as results arrive, then cache it."""
+        chunks = [b"["]
+        failed = False
+        yield chunks[0]
+        for future in futures:
             try:
-                if not check_server_health(server):
-                    continue
-                client = FastMCPHttpClient(f"{server.url}:{server.port}")
-                for tool in client.list_tools():
-                    tool.name = f"{server.name}.{tool.name}"
-                    all_tools.append(tool)
-            except requests.RequestException as e:
-                print(f"Error fetching tools from {server.name}: {e}")
-                health_cache[server.name] = (datetime.now(), False)
+                tools = future.result()
+            except Exception as e:
+                print(f"Error fetching tools: {e}")
+                failed = True
                 continue
-
-        return json.dumps([tool.model_dump() for tool in all_tools])
-    except KeyError:
-        return jsonify({"error": f"Server '{server_name}' not found"}), 404
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            for tool in tools:
+                separator = b"," if len(chunks) > 1 else b""
+                chunk = separator + tool.model_dump_json().encode()
+                chunks.append(chunk)
+                yield chunk
+        chunks.append(b"]")
+        yield chunks[-1]
+
+        if failed:
+            return  # Never cache a body that is missing a server's tools
+
+        with STATE_LOCK:
+            # Don't cache a body built against servers that changed meanwhile
+            if version == TOOLS_VERSION:
+                TOOLS_CACHE[cache_key] = (etag, b"".join(chunks))
+
+    # Headers go out before it is known whether every server answered, so the
+    # streamed body carries no ETag; only complete cached bodies get one.
+    return Response(_stream(), mimetype="application/json")
+
+
+def _call_server_tool(
+    server: Server, tool_name: str, arguments: dict
+) -> list[dict] | None:
+    """Call a tool on a server, returning None if the server lacks the tool.
+
+    With a fresh tool index the tool is called directly. Otherwise discovery and
+    invocation go out as one batch, falling back to separate requests for
+    servers without batch support.
+    """
+    client = _get_client(server)
+    available_names = _indexed_tools(server.name)
+    if available_names is None:
+        try:
+            listing, called = client.batch(
+                [
+                    ("list_tools", {}),
+                    ("call_tool", {"name": tool_name, "arguments": arguments}),
+                ]
+            )
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            listing = called = None  # Server predates the batch endpoint
+
+        if listing is not None:
+            if "error" in listing:
+                raise requests.RequestException(listing["error"]["message"])
+            available_tools = [Tool.model_validate(t) for t in listing["result"]]
+            if tool_name not in _index_tools(server.name, available_tools):
+                return None
+            if "error" in called:
+                raise requests.RequestException(called["error"]["message"])
+            return called["result"]
+
+        available_tools = client.list_tools(timeout=LIST_TOOLS_TIMEOUT)
+        available_names = _index_tools(server.name, available_tools)
+
+    if tool_name not in available_names:
+        return None
+
+    result = client.call_tool(tool_name, arguments)
+    return [content.model_dump(mode="json") for content in result]
 
 
 @app.route("/tools/call_tool", methods=["POST"])
 def call_tool():
     """Call a tool on a specific server."""
-    data = request.get_json()
+    data = _parse_json_object()
+    if data is None:
+        return ERR_INVALID_JSON
     name = data.pop("name", None)  # Extract and remove name from arguments
 
     if name is None:
-        return jsonify({"error": "Tool name not provided"}), 400
+        return ERR_NO_NAME
 
     server_name = None
     tool_name = name
@@ -232,44 +555,35 @@ def call_tool():
 
         # Add permission server tool restriction
         if tool_name == "ask_for_permission" and server_name != PERMISSION_SERVER_NAME:
-            return jsonify({"error": "Permission denied: unauthorized server"}), 403
+            return ERR_UNAUTHORIZED_SERVER
 
         if server_name not in servers:
-            return jsonify({"error": f"Server '{server_name}' not found"}), 404
+            return _json_response({"error": f"Server '{server_name}' not found"}, 404)
         target_servers = [servers[server_name]]
     else:
         # If no server specified, search all servers for the tool
         if tool_name == "ask_for_permission":
             target_servers = [servers[PERMISSION_SERVER_NAME]]
         else:
-            target_servers = [s for s in servers.values() if check_server_health(s)]
+            target_servers = _healthy_servers(list(servers.values()))
 
     # Try each potential server
     for server in target_servers:
         try:
-            client = FastMCPHttpClient(f"{server.url}:{server.port}")
-            # Check if the tool exists on this server
-            available_tools = client.list_tools()
-            print("AVAILABLE TOOLS", available_tools)
-            if not any(t.name == tool_name for t in available_tools):
-                continue
-
-            # Found the tool, try to call it
-            result = client.call_tool(
-                tool_name, data
-            )  # Use remaining data as arguments
-            return jsonify([content.model_dump() for content in result])
-
+            result = _call_server_tool(server, tool_name, data)
         except requests.RequestException:
-            # If this server fails, try the next one
+            # If this server fails, forget its tools and try the next one
+            _evict_tool_index(server.name)
             continue
+        if result is not None:
+            return _json_response(result)
 
     # If we get here, we didn't find the tool on any server
     error_msg = f"Tool '{tool_name}' not found"
     if server_name:
         error_msg += f" on server '{server_name}'"
     print("ERROR", error_msg)
-    return jsonify({"error": error_msg}), 404
+    return _json_response({"error": error_msg}, 404)
 
 
 def load_permission_server():
@@ -294,7 +608,21 @@ def load_permission_server():
         daemon=True,
     )
     permission_thread.start()
-    time.sleep(1)
+
+    # Wait until the permission server answers its health check
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            response = SESSION.get(
+                f"{permission_server_instance.base_url}/health", timeout=0.1
+            )
+            if response.status_code == 200:
+                break
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    else:
+        print("Permission server did not become ready within 5 seconds")
 
 
 def run():
@@ -309,4 +637,5 @@ def run():
             print("Loaded server:", server)
 
     save_servers()
-    app.run(debug=False, port=31337)
+    Thread(target=_health_loop, daemon=True).start()
+    serve(app, host="127.0.0.1", port=31337, threads=16)